@@ -4,7 +4,7 @@ This module implements a simple P controller.
 
 """
 
-def compute_control(y):
+def compute_control(y, u=None):
     '''Compute the control input from the measurement.
 
     Parameters
@@ -12,6 +12,9 @@ def compute_control(y):
     y : dict
         Contains the current values of the measurements.
         {<measurement_name>:<measurement_value>}
+    u : dict, optional
+        Control input to update in place, e.g. as returned by initialize().
+        Default is None, in which case a new dictionary is created.
 
     Returns
     -------
@@ -21,11 +24,13 @@ def compute_control(y):
 
     '''
 
+    if u is None:
+        u = dict()
     # Compute control
-    u = {'oveTSetRooHea_u':22+273.15,
-         'oveTSetRooHea_activate':1,
-         'oveTSetRooCoo_u':23+273.15,
-         'oveTSetRooCoo_activate':1}
+    u['oveTSetRooHea_u'] = 22+273.15
+    u['oveTSetRooHea_activate'] = 1
+    u['oveTSetRooCoo_u'] = 23+273.15
+    u['oveTSetRooCoo_activate'] = 1
 
     return u
 
@@ -31,6 +31,8 @@ class cutomizedKPI(object):
              self.model = model_class(config)
         # initialize the data buffer
              self.data_buff=None
+        # resolve the data point names once for the streaming data
+             self.point_names=list(self.data_points.values())
         else:
              print('KPI definition is not sufficient')
              sys.exit()
@@ -38,9 +40,7 @@ class cutomizedKPI(object):
     # A function to process the streaming data
     def processing_data(self,data):
     # A temporary array to contain the streaming data
-        temp=[]
-        for point in self.data_points:
-               temp.append(data[self.data_points[point]])
+        temp=[data[name] for name in self.point_names]
     # Customized data post-processing
         self.data_buff = self.model.processing_data(self.data_buff,temp)
         return
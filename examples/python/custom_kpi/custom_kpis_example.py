@@ -3,6 +3,7 @@
 This module helps user to understand how to define KPI classes
 
 """
+import collections
 import numpy as np
 
 class MovingAve(object):
@@ -13,13 +14,13 @@ class MovingAve(object):
     def processing_data(self,data_buff,data):
     # initialize the data arrays
         if data_buff is None:
-           data_buff=[]
+           data_buff=collections.deque()
            data_buff.append(sum(data))
     # keep a moving window
         else:
            data_buff.append(sum(data))
            if len(data_buff)>=self.data_point_num:
-                 data_buff.pop(0)
+                 data_buff.popleft()
         return data_buff
 
     def calculation(self,data_buff):
@@ -36,5 +37,5 @@ class Deviation(object):
         return data_buff
 
     def calculation(self,data_buff):
-        temp=np.array(data_buff)-np.array(([self.setpoint]*len(data_buff)))
-        return sum(temp)/len(temp)
+        temp=np.asarray(data_buff, dtype=float)-self.setpoint
+        return temp.mean()
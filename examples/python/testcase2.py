@@ -12,9 +12,17 @@ imported from a different module.
 import sys
 import pathlib
 import requests
+from requests.adapters import HTTPAdapter
 import time
+from itertools import chain
+from multiprocessing.pool import ThreadPool
 import json,collections
+import numpy as np
 import pandas as pd
+try:
+    import orjson
+except ImportError:
+    orjson = None
 # Add BOPTEST repository to PYTHONPATH for this example
 sys.path.insert(0, str(pathlib.Path(__file__).absolute().parents[2]))
 # Add custom KPI calculation
@@ -27,7 +35,36 @@ from examples.python.custom_kpi import custom_kpi_calculator as kpicalculation
 from examples.python.controllers import sup
 # ----------------------
 
-def run(plot=False, customized_kpi_config=None):
+# HTTP SESSION
+# ------------
+# Reuse a single keep-alive connection for all requests to the test case
+session = requests.Session()
+session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+def _json(response):
+    '''Decode the json body of a response, with orjson if it is installed.
+
+    Falls back to the standard decoder if orjson is not available or cannot
+    parse the body, e.g. when it contains NaN values.
+
+    '''
+
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass
+    return response.json()
+
+# Units of the core KPIs for reporting
+_KPI_UNITS = {'ener_tot':'kWh',
+              'tdis_tot':'Kh',
+              'idis_tot':'ppmh',
+              'cost_tot':'Euro or $',
+              'emis_tot':'KgCO2'}
+# ------------
+
+def run(plot=False, customized_kpi_config=None, verbose=False):
     '''Run test case.
 
     Parameters
@@ -38,6 +75,9 @@ def run(plot=False, customized_kpi_config=None):
     customized_kpi_config : string, optional
         The path of the json file which contains the customized kpi information.
         Default is None.
+    verbose : bool, optional
+        True to print the customized KPI values at every step.
+        Default is False.
 
     Returns
     -------
@@ -47,7 +87,8 @@ def run(plot=False, customized_kpi_config=None):
     res : dict
         Dictionary of trajectories of inputs and outputs.
     customizedkpis_result: dict
-        Dictionary of tracked custom KPI calculations.
+        Dictionary of tracked custom KPI calculations as numpy arrays
+        with one value per simulation step.
         Empty if no customized KPI calculations defined.
 
     '''
@@ -59,22 +100,23 @@ def run(plot=False, customized_kpi_config=None):
     # Set simulation parameters
     length = 24*3600*2
     step = 3600
+    n_steps = int(length/step)
     # ---------------
 
     # GET TEST INFORMATION
     # --------------------
     print('\nTEST CASE INFORMATION\n---------------------')
     # Test case name
-    name = requests.get('{0}/name'.format(url)).json()
+    name = session.get('{0}/name'.format(url)).json()
     print('Name:\t\t\t\t{0}'.format(name))
     # Inputs available
-    inputs = requests.get('{0}/inputs'.format(url)).json()
+    inputs = session.get('{0}/inputs'.format(url)).json()
     print('Control Inputs:\t\t\t{0}'.format(inputs))
     # Measurements available
-    measurements = requests.get('{0}/measurements'.format(url)).json()
+    measurements = session.get('{0}/measurements'.format(url)).json()
     print('Measurements:\t\t\t{0}'.format(measurements))
     # Default simulation step
-    step_def = requests.get('{0}/step'.format(url)).json()
+    step_def = session.get('{0}/step'.format(url)).json()
     print('Default Simulation Step:\t{0}'.format(step_def))
 
     # Define customized KPI if any
@@ -84,9 +126,10 @@ def run(plot=False, customized_kpi_config=None):
         with open(customized_kpi_config) as f:
                 config=json.load(f,object_pairs_hook=collections.OrderedDict)
         for key in config.keys():
-               customizedkpis.append(kpicalculation.cutomizedKPI(config[key]))
-               customizedkpis_result[kpicalculation.cutomizedKPI(config[key]).name]=[]
-    customizedkpis_result['time']=[]
+               customizedkpi = kpicalculation.cutomizedKPI(config[key])
+               customizedkpis.append(customizedkpi)
+               customizedkpis_result[customizedkpi.name]=np.empty(n_steps) # Preallocate one value per step
+    customizedkpis_result['time']=np.empty(n_steps if customized_kpi_config is not None else 0)
     # --------------------
 
 
@@ -95,28 +138,50 @@ def run(plot=False, customized_kpi_config=None):
     start = time.time()
     # Initialize test case
     print('Initializing test case simulation.')
-    res = requests.put('{0}/initialize'.format(url), data={'start_time':0,'warmup_period':0}).json()
+    res = session.put('{0}/initialize'.format(url), data={'start_time':0,'warmup_period':0}).json()
     if res:
         print('Successfully initialized the simulation')
     print('\nRunning test case...')
     # Set simulation step
-    res = requests.put('{0}/step'.format(url), data={'step':step})
+    res = session.put('{0}/step'.format(url), data={'step':step})
     # Initialize u
     u = sup.initialize()
+    # Set loop invariants once for the simulation loop
+    advance_url = '{0}/advance'.format(url)
+    post = session.post
+    compute_control = sup.compute_control
     # Simulation Loop
-    for i in range(int(length/step)):
-        # Advance simulation
-        y = requests.post('{0}/advance'.format(url), data=u).json()
-        # Compute next control signal
-        u = sup.compute_control(y)
-        # Compute customized KPIs if any
-        if customized_kpi_config is not None:
-             for customizedkpi in customizedkpis:
-                  customizedkpi.processing_data(y) # Process data as needed for custom KPI
-                  customizedkpi_value = customizedkpi.calculation() # Calculate custom KPI value
-                  customizedkpis_result[customizedkpi.name].append(round(customizedkpi_value,2)) # Track custom KPI value
-                  print('KPI:\t{0}:\t{1}'.format(customizedkpi.name,round(customizedkpi_value,2))) # Print custom KPI value
-             customizedkpis_result['time'].append(y['time']) # Track custom KPI calculation time
+    if customized_kpi_config is None:
+        for i in range(n_steps):
+            # Advance simulation
+            y = _json(post(advance_url, data=u))
+            # Compute next control signal
+            u = compute_control(y, u)
+    else:
+        # Send each advance request from a worker thread so that it overlaps
+        # with the custom KPI calculations of the previous step
+        pool = ThreadPool(1)
+        try:
+            pending = pool.apply_async(post, (advance_url,), {'data':u})
+            for i in range(n_steps):
+                # Advance simulation
+                y = _json(pending.get())
+                # Compute next control signal
+                u = compute_control(y, u)
+                # Request the next step before computing customized KPIs
+                if i < n_steps-1:
+                    pending = pool.apply_async(post, (advance_url,), {'data':u})
+                # Compute customized KPIs
+                for customizedkpi in customizedkpis:
+                     customizedkpi.processing_data(y) # Process data as needed for custom KPI
+                     customizedkpi_value = round(customizedkpi.calculation(),2) # Calculate custom KPI value
+                     customizedkpis_result[customizedkpi.name][i] = customizedkpi_value # Track custom KPI value
+                     if verbose:
+                          print('KPI:\t{0}:\t{1}'.format(customizedkpi.name,customizedkpi_value)) # Print custom KPI value
+                customizedkpis_result['time'][i] = y['time'] # Track custom KPI calculation time
+        finally:
+            pool.close()
+            pool.join()
     print('\nTest case complete.')
     print('Elapsed time of test was {0} seconds.'.format(time.time()-start))
     # -------------
@@ -124,43 +189,40 @@ def run(plot=False, customized_kpi_config=None):
     # VIEW RESULTS
     # ------------
     # Report KPIs
-    kpi = requests.get('{0}/kpi'.format(url)).json()
+    kpi = session.get('{0}/kpi'.format(url)).json()
     print('\nKPI RESULTS \n-----------')
-    for key in kpi.keys():
-        if key == 'ener_tot':
-            unit = 'kWh'
-        elif key == 'tdis_tot':
-            unit = 'Kh'
-        elif key == 'idis_tot':
-            unit = 'ppmh'
-        elif key == 'cost_tot':
-            unit = 'Euro or $'
-        elif key == 'emis_tot':
-            unit = 'KgCO2'
-        else:
-            unit = None
-        print('{0}: {1} {2}'.format(key, kpi[key], unit))
+    for key, value in kpi.items():
+        print('{0}: {1} {2}'.format(key, value, _KPI_UNITS.get(key)))
     # ------------
 
     # POST PROCESS RESULTS
     # --------------------
     # Get result data
-    points = list(measurements.keys()) + list(inputs.keys())
-    df_res = pd.DataFrame()
+    points = list(chain(measurements, inputs))
+    # Request all points at once, they share the same time
+    response = session.put('{0}/results'.format(url), data={'point_name':points,'start_time':0, 'final_time':length})
+    response.raise_for_status()
+    results = _json(response)
+    missing = [point for point in points if point not in results]
+    if missing:
+        raise ValueError('Points {0} not in results.'.format(missing))
+    cols = {}
     for point in points:
-        res = requests.put('{0}/results'.format(url), data={'point_name':point,'start_time':0, 'final_time':length}).json()
-        df_res = pd.concat((df_res,pd.DataFrame(data=res[point], index=res['time'],columns=[point])), axis=1)
-    df_res.index.name = 'time'
-    t = df_res.index.values/3600 # convert s --> hr
-    TRooAir = df_res['TRooAir_y'].values-273.15 # convert K --> C
-    TSetRooHea = df_res['oveTSetRooHea_u'].values-273.15 # convert K --> C
-    TSetRooCoo = df_res['oveTSetRooCoo_u'].values-273.15 # convert K --> C
-    PFan = df_res['PFan_y'].values
-    PCoo = df_res['PCoo_y'].values
-    PHea = df_res['PHea_y'].values
-    PPum = df_res['PPum_y'].values
+        cols[point] = np.asarray(results[point])
+    index = results['time']
+    # Build the frame once from all columns, which share the same time index
+    df_res = pd.DataFrame(cols, index=pd.Index(index, name='time'), columns=points)
     # Plot results
     if plot:
+        # Work on the column arrays directly rather than through the frame
+        t = np.asarray(index)/3600 # convert s --> hr
+        TRooAir = cols['TRooAir_y']-273.15 # convert K --> C
+        TSetRooHea = cols['oveTSetRooHea_u']-273.15 # convert K --> C
+        TSetRooCoo = cols['oveTSetRooCoo_u']-273.15 # convert K --> C
+        PFan = cols['PFan_y']
+        PCoo = cols['PCoo_y']
+        PHea = cols['PHea_y']
+        PPum = cols['PPum_y']
         from matplotlib import pyplot as plt
         plt.figure(1)
         plt.title('Zone Temperature')
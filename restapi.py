@@ -51,9 +51,13 @@ for arg in forecast_parameters:
 parser_scenario = reqparse.RequestParser()
 parser_scenario.add_argument('electricity_price')
 parser_scenario.add_argument('time_period')
+# ``kpi_batch`` interface
+parser_kpi_batch = reqparse.RequestParser()
+parser_kpi_batch.add_argument('electricity_price', action='append', required=True, \
+                              choices=('constant', 'dynamic', 'highly_dynamic'))
 # ``results`` interface
 results_var = reqparse.RequestParser()
-results_var.add_argument('point_name')
+results_var.add_argument('point_name', action='append', required=True)
 results_var.add_argument('start_time')
 results_var.add_argument('final_time')
 # -----------------------
@@ -118,12 +122,15 @@ class Results(Resource):
     def put(self):
         '''PUT request to receive measurement data.'''
         args = results_var.parse_args(strict=True)
-        var  = args['point_name']
         start_time  = float(args['start_time'])
         final_time  = float(args['final_time'])
-        Y = case.get_results(var, start_time, final_time)
-        for key in Y:
-            Y[key] = Y[key].tolist()
+        # Several point names can be given to get them in one request,
+        # all points share the same time
+        Y = dict()
+        for var in args['point_name']:
+            Y_var = case.get_results(var, start_time, final_time)
+            Y[var] = Y_var[var].tolist()
+        Y['time'] = Y_var['time'].tolist()
 
         return Y
 
@@ -135,6 +142,15 @@ class KPI(Resource):
         kpi = case.get_kpis()
         return kpi
 
+class KPI_Batch(Resource):
+    '''Interface to test case KPIs for several price scenarios.'''
+
+    def put(self):
+        '''PUT request to receive KPI data for each electricity price.'''
+        args = parser_kpi_batch.parse_args(strict=True)
+        kpis = case.get_kpis_batch(args['electricity_price'])
+        return kpis
+
 class Forecast_Parameters(Resource):
     '''Interface to test case forecast parameters.'''
 
@@ -200,6 +216,7 @@ api.add_resource(Inputs, '/inputs')
 api.add_resource(Measurements, '/measurements')
 api.add_resource(Results, '/results')
 api.add_resource(KPI, '/kpi')
+api.add_resource(KPI_Batch, '/kpi_batch')
 api.add_resource(Forecast_Parameters, '/forecast_parameters')
 api.add_resource(Forecast, '/forecast')
 api.add_resource(Scenario, '/scenario')
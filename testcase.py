@@ -441,6 +441,41 @@ class TestCase(object):
 
         return kpis
 
+    def get_kpis_batch(self, electricity_prices):
+        '''Returns KPI data for several electricity price scenarios.
+
+        The electricity price of the current scenario is not changed.
+
+        Parameters
+        ----------
+        electricity_prices : list of str
+            Electricity price scenarios to calculate KPIs for.
+            Each 'constant' or 'dynamic' or 'highly_dynamic'.
+
+        Returns
+        -------
+        kpis : dict
+            Dictionary containing KPI names and values for each
+            electricity price scenario.
+            {<electricity_price>:{<kpi_name>:<kpi_value>}}
+
+        '''
+
+        electricity_price = self.scenario['electricity_price']
+        kpis = dict()
+        try:
+            for price in electricity_prices:
+                # Reset KPI Calculator as when the scenario is changed
+                self.scenario['electricity_price'] = price
+                self.cal.initialize()
+                kpis[price] = self.get_kpis()
+        finally:
+            # Restore the scenario and recalculate its KPIs when next requested
+            self.scenario['electricity_price'] = electricity_price
+            self.cal.initialize()
+
+        return kpis
+
     def set_forecast_parameters(self,horizon,interval):
         '''Sets the forecast horizon and interval, both in seconds.
 
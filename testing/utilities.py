@@ -6,6 +6,7 @@ common functions and partial classes.
 """
 
 import os
+import sys
 import requests
 import unittest
 import numpy as np
@@ -13,17 +14,76 @@ import json
 import pandas as pd
 import re
 import matplotlib.pyplot as plt
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Expected formats of the BOPTEST version, as three decimal digits
+# seperated by periods or as the development version
+_R_VERSION_NUM = re.compile(r'\d\.\d\.\d\Z')
+_R_VERSION_X = re.compile(r'0\.x\.x\Z')
+# Start time in seconds of each season tested by partialTestSeason
+_SEASON_START = {'winter':1*24*3600,
+                 'summer':248*24*3600,
+                 'shoulder':118*24*3600}
+# HTTP session reused by all requests to the deployed test case
+_SESSION = requests.Session()
+
+def _loads(content):
+    '''Decodes json content, with orjson if it is installed.
+
+    Falls back to the standard decoder if orjson is not available or cannot
+    parse the content, e.g. when it contains NaN values.
 
+    Parameters
+    ----------
+    content : bytes or str
+        Json content to decode.
+
+    Returns
+    -------
+    obj : dict, list, str or numeric
+        Decoded json object.
+
+    '''
+
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(content)
+
+def _json(response):
+    '''Decodes the json body of a response to the deployed test case.
+
+    Parameters
+    ----------
+    response : requests Response
+        Response to decode.
+
+    Returns
+    -------
+    obj : dict, list, str or numeric
+        Decoded json body.
+
+    '''
+
+    return _loads(response.content)
+
+# Path to the root repository directory
+_ROOT_PATH = os.path.split(os.path.dirname(os.path.realpath(__file__)))[0]
 
 def get_root_path():
     '''Returns the path to the root repository directory.
 
     '''
 
-    testing_path = os.path.dirname(os.path.realpath(__file__));
-    root_path = os.path.split(testing_path)[0]
+    return _ROOT_PATH
 
-    return root_path;
+# File extensions removed by clean_up
+_CLEAN_UP_SUFFIXES = ('.fmu', '.mo', '.txt', '.mat', '.json')
 
 def clean_up(dir_path):
     '''Cleans up the .fmu, .mo, .txt, .mat, .json files from directory.
@@ -37,7 +97,7 @@ def clean_up(dir_path):
 
     files = os.listdir(dir_path)
     for f in files:
-        if f.endswith('.fmu') or f.endswith('.mo') or f.endswith('.txt') or f.endswith('.mat') or f.endswith('.json'):
+        if f.endswith(_CLEAN_UP_SUFFIXES):
             os.remove(os.path.join(dir_path, f))
 
 def run_tests(test_file_name):
@@ -51,8 +111,19 @@ def run_tests(test_file_name):
     '''
 
     # Load tests
+    testing_dir = os.path.join(get_root_path(),'testing')
     test_loader = unittest.TestLoader()
-    suite = test_loader.discover(os.path.join(get_root_path(),'testing'), pattern = test_file_name)
+    if os.path.isfile(os.path.join(testing_dir, test_file_name)):
+        # Import the test module directly instead of discovering the testing directory
+        if testing_dir not in sys.path:
+            sys.path.insert(0, testing_dir)
+        try:
+            suite = test_loader.loadTestsFromName(os.path.splitext(test_file_name)[0])
+        except Exception:
+            # Python 2 raises import errors, discover reports them as failed tests
+            suite = test_loader.discover(testing_dir, pattern = test_file_name)
+    else:
+        suite = test_loader.discover(testing_dir, pattern = test_file_name)
     num_cases = suite.countTestCases()
     # Run tests
     print('\nFound {0} tests to run in {1}.\n\nRunning...'.format(num_cases, test_file_name))
@@ -120,27 +191,88 @@ def compare_references(vars_timeseries = ['reaTRoo_y'],
                         vars_to_plot = df_old.columns
 
                     if 'kpis_' in filename:
-                        fig, axs = plt.subplots(nrows=1, ncols=len(df_old.index), figsize=(10,8))
-                        for i,k in enumerate(df_old.index):
-                            axs[i].bar(0, df_old.loc[k,'value'], label='old', alpha=0.5, color='orange')
-                            axs[i].bar(0, df_new.loc[k,'value'], label='new', alpha=0.5, color='blue')
-                            axs[i].set_title(k)
+                        # Keep one axis per kpi since their scales differ
+                        values_old = df_old['value'].to_numpy()
+                        values_new = df_new['value'].reindex(df_old.index).to_numpy()
+                        fig, axs = plt.subplots(nrows=1, ncols=len(df_old.index), figsize=(10,8), squeeze=False)
+                        for ax, k, value_old, value_new in zip(axs[0], df_old.index, values_old, values_new):
+                            ax.bar(0, value_old, label='old', alpha=0.5, color='orange')
+                            ax.bar(0, value_new, label='new', alpha=0.5, color='blue')
+                            ax.set_title(k)
                         fig.suptitle(str(f_new))
                         plt.legend()
                     else:
-                        if any([v in df_old.keys() for v in vars_to_plot]):
-                            for v in vars_to_plot:
-                                if v in df_old.keys():
-                                    _, ax = plt.subplots(1, figsize=(10,8))
-                                    df_old[v].plot(ax=ax, label='old '+v, kind=kind, alpha=0.5, color='orange')
-                                    df_new[v].plot(ax=ax, label='new '+v, kind=kind, alpha=0.5, color='blue')
-                                    ax.set_title(str(f_new))
-                                    ax.legend()
+                        vars_in_file = [v for v in vars_to_plot if v in df_old.keys()]
+                        if vars_in_file:
+                            # Plot all variables of a file in one figure
+                            fig, axs = plt.subplots(nrows=len(vars_in_file), ncols=1, figsize=(10,8), squeeze=False)
+                            for ax, v in zip(axs[:,0], vars_in_file):
+                                df_old[v].plot(ax=ax, label='old '+v, kind=kind, alpha=0.5, color='orange')
+                                df_new[v].plot(ax=ax, label='new '+v, kind=kind, alpha=0.5, color='blue')
+                                ax.legend()
+                            fig.suptitle(str(f_new))
                         else:
                             print('File: {} has not been compared because it does not contain any of the variables to plot'.format(f_old))
 
     plt.show()
 
+# Reference files read before, keyed on file path and modification time
+# so that updated references are read again
+_REF_CSV_CACHE = {}
+_REF_JSON_CACHE = {}
+
+def _read_ref_csv(ref_filepath, index_col):
+    '''Returns a copy of a reference csv dataframe, read at most once per
+    modification of the file, using the pyarrow parser if it is available.
+
+    Parameters
+    ----------
+    ref_filepath : str
+        Reference file path.
+    index_col : str
+        Name of the column to use as index.
+
+    Returns
+    -------
+    df_ref : pandas DataFrame
+        Reference dataframe.
+
+    '''
+
+    key = (ref_filepath, os.path.getmtime(ref_filepath), index_col)
+    if key not in _REF_CSV_CACHE:
+        try:
+            df_ref = pd.read_csv(ref_filepath, index_col=index_col, engine='pyarrow')
+        except (ImportError, ValueError):
+            # pyarrow not installed or engine not supported by this pandas
+            df_ref = pd.read_csv(ref_filepath, index_col=index_col)
+        _REF_CSV_CACHE[key] = df_ref
+
+    return _REF_CSV_CACHE[key].copy()
+
+def _read_ref_json(ref_filepath):
+    '''Returns a reference json, read at most once per modification of
+    the file.
+
+    Parameters
+    ----------
+    ref_filepath : str
+        Reference file path.
+
+    Returns
+    -------
+    json_ref : dict
+        Reference json.  Shared between calls, do not modify.
+
+    '''
+
+    key = (ref_filepath, os.path.getmtime(ref_filepath))
+    if key not in _REF_JSON_CACHE:
+        with open(ref_filepath, 'rb') as f:
+            _REF_JSON_CACHE[key] = _loads(f.read())
+
+    return _REF_JSON_CACHE[key]
+
 class partialChecks(object):
     '''This partial class implements common ref data check methods.
 
@@ -167,18 +299,22 @@ class partialChecks(object):
         # Perform test
         if os.path.exists(ref_filepath):
             # If reference exists, check it
-            df_ref = pd.read_csv(ref_filepath, index_col='time')
+            df_ref = _read_ref_csv(ref_filepath, 'time')
             # Check all keys in reference are in test
-            for key in df_ref.columns.to_list():
-                self.assertTrue(key in df.columns.to_list(), 'Reference key {0} not in test data.'.format(key))
+            keys_missing = set(df_ref.columns) - set(df.columns)
+            self.assertFalse(keys_missing, 'Reference keys {0} not in test data.'.format(sorted(keys_missing)))
             # Check all keys in test are in reference
-            for key in df.columns.to_list():
-                self.assertTrue(key in df_ref.columns.to_list(), 'Test key {0} not in reference data.'.format(key))
-            # Check trajectories
-            for key in df.columns:
-                y_test = self.create_test_points(df[key]).to_numpy()
-                y_ref = self.create_test_points(df_ref[key]).to_numpy()
-                results = self.check_trajectory(y_test, y_ref)
+            keys_missing = set(df.columns) - set(df_ref.columns)
+            self.assertFalse(keys_missing, 'Test keys {0} not in reference data.'.format(sorted(keys_missing)))
+            keys = df.columns
+            # Identical trajectories pass without interpolation or error calculation
+            if df.index.equals(df_ref.index) and np.array_equal(df.to_numpy(), df_ref[keys].to_numpy()):
+                return None
+            # Check trajectories, interpolating all keys at once
+            y_test = self.create_test_points(df[keys]).to_numpy()
+            y_ref = self.create_test_points(df_ref[keys]).to_numpy()
+            for i, key in enumerate(keys):
+                results = self.check_trajectory(y_test[:,i], y_ref[:,i])
                 self.assertTrue(results['Pass'], '{0} Key is {1}.'.format(results['Message'],key))
         else:
             # Otherwise, save as reference
@@ -205,9 +341,10 @@ class partialChecks(object):
             # Perform test
             if os.path.exists(ref_filepath):
                 # If reference exists, check it
-                with open(ref_filepath, 'r') as f:
-                    json_ref = json.load(f)
-                self.assertTrue(json_test==json_ref, 'json_test:\n{0}\ndoes not equal\njson_ref:\n{1}'.format(json_test, json_ref))
+                json_ref = _read_ref_json(ref_filepath)
+                # Only format the message when the check fails
+                if json_test != json_ref:
+                    self.fail('json_test:\n{0}\ndoes not equal\njson_ref:\n{1}'.format(json_test, json_ref))
             else:
                 # Otherwise, save as reference
                 with open(ref_filepath, 'w') as f:
@@ -237,12 +374,17 @@ class partialChecks(object):
         # Perform test
         if os.path.exists(ref_filepath):
             # If reference exists, check it
-            df_ref = pd.read_csv(ref_filepath, index_col='keys')
-            for key in df.index.values:
-                y_test = [df.loc[key,'value']]
-                y_ref = [df_ref.loc[key,'value']]
-                results = self.check_trajectory(y_test, y_ref)
-                self.assertTrue(results['Pass'], '{0} Key is {1}.'.format(results['Message'],key))
+            df_ref = _read_ref_csv(ref_filepath, 'keys')
+            # Check all keys in test are in reference
+            keys_missing = set(df.index) - set(df_ref.index)
+            self.assertFalse(keys_missing, 'Test keys {0} not in reference data.'.format(sorted(keys_missing)))
+            # Check values of all keys at once
+            y_test = df['value'].to_numpy()
+            y_ref = df_ref['value'].reindex(df.index).to_numpy()
+            results = self.check_trajectory(y_test, y_ref)
+            if not results['Pass']:
+                key = df.index[results['IndexMax']]
+                self.fail('{0} Key is {1}.'.format(results['Message'],key))
         else:
             # Otherwise, save as reference
             df.to_csv(ref_filepath)
@@ -282,30 +424,29 @@ class partialChecks(object):
         if len(y_test) != len(y_ref):
             result['Pass'] = False
             result['Message'] = 'Test and reference trajectory not the same length.'
-        else:
-            # Initialize error arrays
-            err_abs = np.zeros(len(y_ref))
-            err_rel = np.zeros(len(y_ref))
-            err_fun = np.zeros(len(y_ref))
-            # Calculate errors
-            for i in range(len(y_ref)):
-                # Absolute error
-                err_abs[i] = np.absolute(y_test[i] - y_ref[i])
-                # Relative error
-                if (abs(y_ref[i]) > 10 * tol):
-                    err_rel[i] = err_abs[i] / abs(y_ref[i])
-                else:
-                    err_rel[i] = 0
-                # Total error
-                err_fun[i] = err_abs[i] + err_rel[i]
-                # Assess error
-                err_max = max(err_fun);
-                i_max = np.argmax(err_fun);
-                if err_max > tol:
-                    result['Pass'] = False
-                    result['ErrorMax'] = err_max,
-                    result['IndexMax'] = i_max,
-                    result['Message'] = 'Max error ({0}) in trajectory greater than tolerance ({1}) at index {2}. y_test: {3}, y_ref:{4}'.format(err_max, tol, i_max, y_test[i_max], y_ref[i_max])
+            return result
+        # Calculate errors
+        y_test = np.asarray(y_test, dtype=float)
+        y_ref = np.asarray(y_ref, dtype=float)
+        # Absolute error
+        err_abs = np.subtract(y_test, y_ref)
+        np.abs(err_abs, out=err_abs)
+        # Relative error, written directly into the total error
+        y_ref_abs = np.abs(y_ref)
+        err_fun = np.zeros(len(y_ref))
+        np.divide(err_abs, y_ref_abs, out=err_fun, where=y_ref_abs > 10 * tol)
+        # Total error, not counting points where it is undefined
+        err_fun += err_abs
+        err_fun[np.isnan(err_fun)] = 0
+        # Assess error
+        if len(err_fun):
+            i_max = int(np.argmax(err_fun))
+            err_max = err_fun[i_max]
+            if err_max > tol:
+                result['Pass'] = False
+                result['ErrorMax'] = err_max
+                result['IndexMax'] = i_max
+                result['Message'] = 'Max error ({0}) in trajectory greater than tolerance ({1}) at index {2}. y_test: {3}, y_ref:{4}'.format(err_max, tol, i_max, y_test[i_max], y_ref[i_max])
 
         return result
 
@@ -317,32 +458,59 @@ class partialChecks(object):
 
         Parameters
         ----------
-        s : pandas Series
+        s : pandas Series or DataFrame
             Series containing test points to create, with index as time floats.
+            If a DataFrame, each column is interpolated on the same points.
         n : int, optional
             Number of points to create
             Default is 500
 
         Returns
         -------
-        s_test : pandas Series
-            Series containing interpolated data
+        s_test : pandas Series or DataFrame
+            Series containing interpolated data, or DataFrame if s is a
+            DataFrame.
 
         '''
 
         # Get data
-        data = s.to_numpy()
+        data = s.to_numpy(dtype=float)
         index = s.index.values
         # Make interpolated index
         t_min = index.min()
         t_max = index.max()
         t = np.linspace(t_min, t_max, n)
         # Interpolate data
-        data_interp = np.interp(t,index,data)
-        # Use at most 8 significant digits
-        data_interp = [ float('{:.8g}'.format(x)) for x in data_interp ]
-        # Make Series
-        s_test = pd.Series(data=data_interp, index=t)
+        if data.ndim == 1:
+            data_interp = np.interp(t,index,data)
+        else:
+            data_interp = np.empty((n, data.shape[1]))
+            for i in range(data.shape[1]):
+                data_interp[:,i] = np.interp(t,index,data[:,i])
+        # Use at most 8 significant digits, giving the same values as
+        # formatting each one with '{:.8g}'. Values are scaled to 8 digits
+        # by exact powers of ten, which round the same as their decimal
+        # representation unless they are close to half way.
+        values = data_interp.reshape(-1)
+        digits = np.zeros(values.shape)
+        finite = np.isfinite(values) & (values != 0)
+        digits[finite] = 7 - np.floor(np.log10(np.abs(values[finite])))
+        exact = finite & (np.abs(digits) <= 22)
+        power = 10.0**np.abs(digits[exact])
+        up = digits[exact] >= 0
+        scaled = np.where(up, values[exact] * power, values[exact] / power)
+        rounded = np.round(scaled)
+        half = np.abs(scaled - rounded) > 0.5 - 1e-6
+        values[exact] = np.where(half, values[exact], np.where(up, rounded / power, rounded * power))
+        # Format the remaining values
+        slow = finite & ~exact
+        slow[exact] = half
+        values[slow] = [float('{:.8g}'.format(x)) for x in values[slow]]
+        # Make Series or DataFrame
+        if data.ndim == 1:
+            s_test = pd.Series(data=data_interp, index=t)
+        else:
+            s_test = pd.DataFrame(data=data_interp, index=t, columns=s.columns)
 
         return s_test
 
@@ -368,14 +536,49 @@ class partialChecks(object):
 
         '''
 
-        df = pd.DataFrame()
-        for point in points:
-            res = requests.put('{0}/results'.format(url), data={'point_name':point,'start_time':start_time, 'final_time':final_time}).json()
-            df = pd.concat((df,pd.DataFrame(data=res[point], index=res['time'],columns=[point])), axis=1)
+        points = list(points)
+        if not points:
+            df = pd.DataFrame()
+            df.index.name = 'time'
+            return df
+        # Request all points at once, they share the same time
+        response = _SESSION.put('{0}/results'.format(url), data={'point_name':points,'start_time':start_time, 'final_time':final_time})
+        self.assertTrue(response.ok, 'Request for results failed with status {0}.'.format(response.status_code))
+        res = _json(response)
+        missing = [point for point in points if point not in res]
+        self.assertFalse(missing, 'Points {0} not in results.'.format(missing))
+        # Build the dataframe once from all points
+        time = res.pop('time')
+        df = pd.DataFrame(data=res, index=time, columns=points)
         df.index.name = 'time'
 
         return df
 
+    def get_kpis_batch(self, price_scenarios, url='http://127.0.0.1:5000'):
+        '''Get the kpis from boptest for several electricity price scenarios.
+
+        Parameters
+        ----------
+        price_scenarios: list of str
+            List of electricity price scenarios to get kpis for.
+        url: str
+            URL pointing to deployed boptest test case.
+            Default is http://127.0.0.1:5000.
+
+        Returns
+        -------
+        kpis: dict
+            Dictionary of kpis for each price scenario.
+            {<price_scenario>:{<kpi_name>:<kpi_value>}}
+
+        '''
+
+        response = _SESSION.put('{0}/kpi_batch'.format(url), data={'electricity_price':price_scenarios})
+        self.assertTrue(response.ok, 'Request for batch kpis failed with status {0}.'.format(response.status_code))
+        kpis = _json(response)
+
+        return kpis
+
     def get_all_points(self, url='localhost:5000'):
         '''Get all of the input and measurement point names from boptest.
 
@@ -392,8 +595,8 @@ class partialChecks(object):
 
         '''
 
-        measurements = requests.get('{0}/measurements'.format(url)).json()
-        inputs = requests.get('{0}/inputs'.format(url)).json()
+        measurements = _json(_SESSION.get('{0}/measurements'.format(url)))
+        inputs = _json(_SESSION.get('{0}/inputs'.format(url)))
         points = list(measurements.keys()) + list(inputs.keys())
 
         return points
@@ -424,12 +627,10 @@ class partialTestAPI(partialChecks):
         '''
 
         # Get version from BOPTEST API
-        version = requests.get('{0}/version'.format(self.url)).json()
-        # Create a regex object as three decimal digits seperated by period
-        r_num = re.compile('\d.\d.\d')
-        r_x = re.compile('0.x.x')
+        version = _json(_SESSION.get('{0}/version'.format(self.url)))
         # Test that the returned version matches the expected string format
-        if r_num.match(version['version']) or r_x.match(version['version']):
+        v = version['version'].strip()
+        if _R_VERSION_NUM.match(v) or _R_VERSION_X.match(v):
             self.assertTrue(True)
         else:
             self.assertTrue(False, '/version did not return correctly. Returned {0}.'.format(version))
@@ -439,7 +640,7 @@ class partialTestAPI(partialChecks):
 
         '''
 
-        name = requests.get('{0}/name'.format(self.url)).json()
+        name = _json(_SESSION.get('{0}/name'.format(self.url)))
         self.assertEqual(name['name'], self.name)
 
     def test_get_inputs(self):
@@ -447,7 +648,7 @@ class partialTestAPI(partialChecks):
 
         '''
 
-        inputs = requests.get('{0}/inputs'.format(self.url)).json()
+        inputs = _json(_SESSION.get('{0}/inputs'.format(self.url)))
         ref_filepath = os.path.join(get_root_path(), 'testing', 'references', self.name, 'get_inputs.json')
         self.compare_ref_json(inputs, ref_filepath)
 
@@ -456,7 +657,7 @@ class partialTestAPI(partialChecks):
 
         '''
 
-        measurements = requests.get('{0}/measurements'.format(self.url)).json()
+        measurements = _json(_SESSION.get('{0}/measurements'.format(self.url)))
         ref_filepath = os.path.join(get_root_path(), 'testing', 'references', self.name, 'get_measurements.json')
         self.compare_ref_json(measurements, ref_filepath)
 
@@ -465,7 +666,7 @@ class partialTestAPI(partialChecks):
 
         '''
 
-        step = requests.get('{0}/step'.format(self.url)).json()
+        step = _json(_SESSION.get('{0}/step'.format(self.url)))
         df = pd.DataFrame(data=[step], index=['step'], columns=['value'])
         df.index.name = 'keys'
         ref_filepath = os.path.join(get_root_path(), 'testing', 'references', self.name, 'get_step.csv')
@@ -476,12 +677,12 @@ class partialTestAPI(partialChecks):
 
         '''
 
-        step_current = requests.get('{0}/step'.format(self.url)).json()
+        step_current = _json(_SESSION.get('{0}/step'.format(self.url)))
         step = 101
-        requests.put('{0}/step'.format(self.url), data={'step':step})
-        step_set = requests.get('{0}/step'.format(self.url)).json()
+        _SESSION.put('{0}/step'.format(self.url), data={'step':step})
+        step_set = _json(_SESSION.get('{0}/step'.format(self.url)))
         self.assertEqual(step, step_set)
-        requests.put('{0}/step'.format(self.url), data={'step':step_current})
+        _SESSION.put('{0}/step'.format(self.url), data={'step':step_current})
 
     def test_initialize(self):
         '''Test initialization of test simulation.
@@ -491,10 +692,10 @@ class partialTestAPI(partialChecks):
         # Get measurements and inputs
         points = self.get_all_points(self.url)
         # Get current step
-        step = requests.get('{0}/step'.format(self.url)).json()
+        step = _json(_SESSION.get('{0}/step'.format(self.url)))
         # Initialize
         start_time = 0.5*24*3600
-        y = requests.put('{0}/initialize'.format(self.url), data={'start_time':start_time, 'warmup_period':0.5*24*3600}).json()
+        y = _json(_SESSION.put('{0}/initialize'.format(self.url), data={'start_time':start_time, 'warmup_period':0.5*24*3600}))
         # Check that initialize returns the right initial values and results
         df = pd.DataFrame.from_dict(y, orient = 'index', columns=['value'])
         df.index.name = 'keys'
@@ -507,15 +708,15 @@ class partialTestAPI(partialChecks):
         # Check results
         self.compare_ref_timeseries_df(df,ref_filepath)
         # Check kpis
-        res_kpi = requests.get('{0}/kpi'.format(self.url)).json()
+        res_kpi = _json(_SESSION.get('{0}/kpi'.format(self.url)))
         df = pd.DataFrame.from_dict(res_kpi, orient='index', columns=['value'])
         df.index.name = 'keys'
         ref_filepath = os.path.join(get_root_path(), 'testing', 'references', self.name, 'kpis_initialize_initial.csv')
         self.compare_ref_values_df(df, ref_filepath)
         # Advance
         step_advance = 1*24*3600
-        requests.put('{0}/step'.format(self.url), data={'step':step_advance})
-        y = requests.post('{0}/advance'.format(self.url),data = {}).json()
+        _SESSION.put('{0}/step'.format(self.url), data={'step':step_advance})
+        y = _json(_SESSION.post('{0}/advance'.format(self.url),data = {}))
         # Check trajectories
         df = self.results_to_df(points, start_time, start_time+step_advance, self.url)
         # Set reference file path
@@ -523,13 +724,13 @@ class partialTestAPI(partialChecks):
         # Check results
         self.compare_ref_timeseries_df(df,ref_filepath)
         # Check kpis
-        res_kpi = requests.get('{0}/kpi'.format(self.url)).json()
+        res_kpi = _json(_SESSION.get('{0}/kpi'.format(self.url)))
         df = pd.DataFrame.from_dict(res_kpi, orient='index', columns=['value'])
         df.index.name = 'keys'
         ref_filepath = os.path.join(get_root_path(), 'testing', 'references', self.name, 'kpis_initialize_advance.csv')
         self.compare_ref_values_df(df, ref_filepath)
         # Set step back to step
-        requests.put('{0}/step'.format(self.url), data={'step':step})
+        _SESSION.put('{0}/step'.format(self.url), data={'step':step})
 
     def test_advance_no_data(self):
         '''Test advancing of simulation with no input data.
@@ -539,9 +740,9 @@ class partialTestAPI(partialChecks):
 
         '''
 
-        requests.put('{0}/initialize'.format(self.url), data={'start_time':0, 'warmup_period':0})
-        requests.put('{0}/step'.format(self.url), data={'step':self.step_ref})
-        y = requests.post('{0}/advance'.format(self.url), data=dict()).json()
+        _SESSION.put('{0}/initialize'.format(self.url), data={'start_time':0, 'warmup_period':0})
+        _SESSION.put('{0}/step'.format(self.url), data={'step':self.step_ref})
+        y = _json(_SESSION.post('{0}/advance'.format(self.url), data=dict()))
         df = pd.DataFrame.from_dict(y, orient = 'index', columns=['value'])
         df.index.name = 'keys'
         ref_filepath = os.path.join(get_root_path(), 'testing', 'references', self.name, 'advance_no_data.csv')
@@ -572,9 +773,9 @@ class partialTestAPI(partialChecks):
         elif self.name == 'multizone_residential_hydronic':
             u = {'conHeaRo1_oveTSetHea_activate':0, 'conHeaRo1_oveTSetHea_u':273.15+22,
                  'oveEmiPum_activate':0, 'oveEmiPum_u':1}
-        requests.put('{0}/initialize'.format(self.url), data={'start_time':0, 'warmup_period':0})
-        requests.put('{0}/step'.format(self.url), data={'step':self.step_ref})
-        y = requests.post('{0}/advance'.format(self.url), data=u).json()
+        _SESSION.put('{0}/initialize'.format(self.url), data={'start_time':0, 'warmup_period':0})
+        _SESSION.put('{0}/step'.format(self.url), data={'step':self.step_ref})
+        y = _json(_SESSION.post('{0}/advance'.format(self.url), data=u))
         df = pd.DataFrame.from_dict(y, orient = 'index', columns=['value'])
         df.index.name = 'keys'
         ref_filepath = os.path.join(get_root_path(), 'testing', 'references', self.name, 'advance_false_overwrite.csv')
@@ -588,9 +789,9 @@ class partialTestAPI(partialChecks):
         '''
 
         # Initialize
-        requests.put('{0}/initialize'.format(self.url), data={'start_time':0, 'warmup_period':0})
+        _SESSION.put('{0}/initialize'.format(self.url), data={'start_time':0, 'warmup_period':0})
         # Test case forecast
-        forecast = requests.get('{0}/forecast'.format(self.url)).json()
+        forecast = _json(_SESSION.get('{0}/forecast'.format(self.url)))
         df_forecaster = pd.DataFrame(forecast).set_index('time')
         # Set reference file path
         ref_filepath = os.path.join(get_root_path(), 'testing', 'references', self.name, 'get_forecast_default.csv')
@@ -605,14 +806,14 @@ class partialTestAPI(partialChecks):
         # Define forecast parameters
         forecast_parameters_ref = {'horizon':3600, 'interval':300}
         # Set forecast parameters
-        ret = requests.put('{0}/forecast_parameters'.format(self.url),
+        ret = _SESSION.put('{0}/forecast_parameters'.format(self.url),
                            data=forecast_parameters_ref)
         # Get forecast parameters
-        forecast_parameters = requests.get('{0}/forecast_parameters'.format(self.url)).json()
+        forecast_parameters = _json(_SESSION.get('{0}/forecast_parameters'.format(self.url)))
         # Check the forecast parameters
         self.assertDictEqual(forecast_parameters, forecast_parameters_ref)
         # Check the return on the put request
-        self.assertDictEqual(ret.json(), forecast_parameters_ref)
+        self.assertDictEqual(_json(ret), forecast_parameters_ref)
 
     def test_get_forecast_with_parameters(self):
         '''Check that the forecaster is able to retrieve the data.
@@ -624,12 +825,12 @@ class partialTestAPI(partialChecks):
         # Define forecast parameters
         forecast_parameters_ref = {'horizon':3600, 'interval':300}
         # Initialize
-        requests.put('{0}/initialize'.format(self.url), data={'start_time':0, 'warmup_period':0})
+        _SESSION.put('{0}/initialize'.format(self.url), data={'start_time':0, 'warmup_period':0})
         # Set forecast parameters
-        requests.put('{0}/forecast_parameters'.format(self.url),
+        _SESSION.put('{0}/forecast_parameters'.format(self.url),
                      data=forecast_parameters_ref)
         # Test case forecast
-        forecast = requests.get('{0}/forecast'.format(self.url)).json()
+        forecast = _json(_SESSION.get('{0}/forecast'.format(self.url)))
         df_forecaster = pd.DataFrame(forecast).set_index('time')
         # Set reference file path
         ref_filepath = os.path.join(get_root_path(), 'testing', 'references', self.name, 'get_forecast_with_parameters.csv')
@@ -642,14 +843,14 @@ class partialTestAPI(partialChecks):
         '''
 
         # Set scenario
-        scenario_current = requests.get('{0}/scenario'.format(self.url)).json()
+        scenario_current = _json(_SESSION.get('{0}/scenario'.format(self.url)))
         scenario = {'electricity_price':'highly_dynamic',
                     'time_period':self.test_time_period}
-        requests.put('{0}/scenario'.format(self.url), data=scenario)
-        scenario_set = requests.get('{0}/scenario'.format(self.url)).json()
+        _SESSION.put('{0}/scenario'.format(self.url), data=scenario)
+        scenario_set = _json(_SESSION.get('{0}/scenario'.format(self.url)))
         self.assertEqual(scenario, scenario_set)
         # Check initialized correctly
-        measurements = requests.get('{0}/measurements'.format(self.url)).json()
+        measurements = _json(_SESSION.get('{0}/measurements'.format(self.url)))
         # Don't check weather
         points_check = []
         for key in measurements.keys():
@@ -661,21 +862,94 @@ class partialTestAPI(partialChecks):
         # Check results
         self.compare_ref_timeseries_df(df,ref_filepath)
         # Return scenario to original
-        requests.put('{0}/scenario'.format(self.url), data=scenario_current)
+        _SESSION.put('{0}/scenario'.format(self.url), data=scenario_current)
+
+
+    def test_results_multiple_points(self):
+        '''Test getting results for several points in one request.
+
+        '''
+
+        _SESSION.put('{0}/initialize'.format(self.url), data={'start_time':0, 'warmup_period':0})
+        _SESSION.put('{0}/step'.format(self.url), data={'step':self.step_ref})
+        measurements = _json(_SESSION.get('{0}/measurements'.format(self.url)))
+        inputs = _json(_SESSION.get('{0}/inputs'.format(self.url)))
+        _json(_SESSION.post('{0}/advance'.format(self.url), data=dict()))
+        points = list(measurements.keys()) + list(inputs.keys())
+        res_all = _json(_SESSION.put('{0}/results'.format(self.url), data={'point_name':points, \
+                                                                 'start_time':0, \
+                                                                 'final_time':self.step_ref}))
+        self.assertEqual(sorted(res_all.keys()), sorted(points + ['time']))
+        # Check each point against requesting it on its own
+        for point in points:
+            res = _json(_SESSION.put('{0}/results'.format(self.url), data={'point_name':point, \
+                                                                 'start_time':0, \
+                                                                 'final_time':self.step_ref}))
+            self.assertEqual(res['time'], res_all['time'])
+            self.assertEqual(res[point], res_all[point], 'Results of {0} differ.'.format(point))
+
+    def test_results_no_point_name(self):
+        '''Test that results requested without a point name are rejected.
 
+        '''
+
+        response = _SESSION.put('{0}/results'.format(self.url), data={'start_time':0, \
+                                                                      'final_time':self.step_ref})
+        self.assertEqual(response.status_code, 400)
+        response = _SESSION.put('{0}/results'.format(self.url), data={'point_name':[], \
+                                                                      'start_time':0, \
+                                                                      'final_time':self.step_ref})
+        self.assertEqual(response.status_code, 400)
+        # No points give an empty dataframe without a request
+        df = self.results_to_df([], 0, self.step_ref, self.url)
+        self.assertEqual(len(df.columns), 0)
+        self.assertEqual(df.index.name, 'time')
+
+    def test_get_kpis_batch(self):
+        '''Test getting the kpis of several price scenarios in one request.
+
+        '''
+
+        scenario_current = _json(_SESSION.get('{0}/scenario'.format(self.url)))
+        _SESSION.put('{0}/initialize'.format(self.url), data={'start_time':0, 'warmup_period':0})
+        _SESSION.put('{0}/step'.format(self.url), data={'step':self.step_ref})
+        _json(_SESSION.post('{0}/advance'.format(self.url), data=dict()))
+        price_scenarios = ['constant', 'dynamic', 'highly_dynamic']
+        kpis = self.get_kpis_batch(price_scenarios, self.url)
+        self.assertEqual(sorted(kpis.keys()), sorted(price_scenarios))
+        # The scenario is not changed by the batch request
+        self.assertEqual(_json(_SESSION.get('{0}/scenario'.format(self.url))), scenario_current)
+        # An invalid price scenario is rejected
+        response = _SESSION.put('{0}/kpi_batch'.format(self.url), data={'electricity_price':['constant', 'foo']})
+        self.assertEqual(response.status_code, 400)
+        # Check against setting each scenario and getting its kpis
+        for price_scenario in price_scenarios:
+            _SESSION.put('{0}/scenario'.format(self.url), data={'electricity_price':price_scenario})
+            kpi = _json(_SESSION.get('{0}/kpi'.format(self.url)))
+            self.assertEqual(sorted(kpis[price_scenario].keys()), sorted(kpi.keys()))
+            # Compare each kpi, kpis that are not yet defined are NaN
+            for key, value in kpi.items():
+                value_batch = kpis[price_scenario][key]
+                if value is None or value_batch is None:
+                    self.assertEqual(value_batch, value, 'Kpi {0} of {1} differs.'.format(key, price_scenario))
+                else:
+                    self.assertTrue(np.isclose(value_batch, value, rtol=1e-6, atol=1e-9, equal_nan=True), \
+                                    'Kpi {0} of {1} differs: {2} != {3}.'.format(key, price_scenario, value_batch, value))
+        # Return scenario to original
+        _SESSION.put('{0}/scenario'.format(self.url), data={'electricity_price':scenario_current['electricity_price']})
 
     def test_partial_results_inner(self):
         '''Test getting results for start time after and final time before.
 
         '''
 
-        requests.put('{0}/initialize'.format(self.url), data={'start_time':0, 'warmup_period':0})
-        requests.put('{0}/step'.format(self.url), data={'step':self.step_ref})
-        measurements = requests.get('{0}/measurements'.format(self.url)).json()
-        requests.post('{0}/advance'.format(self.url), data=dict()).json()
-        res_inner = requests.put('{0}/results'.format(self.url), data={'point_name':list(measurements.keys())[0], \
+        _SESSION.put('{0}/initialize'.format(self.url), data={'start_time':0, 'warmup_period':0})
+        _SESSION.put('{0}/step'.format(self.url), data={'step':self.step_ref})
+        measurements = _json(_SESSION.get('{0}/measurements'.format(self.url)))
+        _json(_SESSION.post('{0}/advance'.format(self.url), data=dict()))
+        res_inner = _json(_SESSION.put('{0}/results'.format(self.url), data={'point_name':list(measurements.keys())[0], \
                                                                  'start_time':self.step_ref*0.25, \
-                                                                 'final_time':self.step_ref*0.75}).json()
+                                                                 'final_time':self.step_ref*0.75}))
         df = pd.DataFrame.from_dict(res_inner).set_index('time')
         ref_filepath = os.path.join(get_root_path(), 'testing', 'references', self.name, 'partial_results_inner.csv')
         self.compare_ref_timeseries_df(df, ref_filepath)
@@ -685,13 +959,13 @@ class partialTestAPI(partialChecks):
 
         '''
 
-        requests.put('{0}/initialize'.format(self.url), data={'start_time':0, 'warmup_period':0})
-        requests.put('{0}/step'.format(self.url), data={'step':self.step_ref})
-        measurements = requests.get('{0}/measurements'.format(self.url)).json()
-        requests.post('{0}/advance'.format(self.url), data=dict()).json()
-        res_outer = requests.put('{0}/results'.format(self.url), data={'point_name':list(measurements.keys())[0], \
+        _SESSION.put('{0}/initialize'.format(self.url), data={'start_time':0, 'warmup_period':0})
+        _SESSION.put('{0}/step'.format(self.url), data={'step':self.step_ref})
+        measurements = _json(_SESSION.get('{0}/measurements'.format(self.url)))
+        _json(_SESSION.post('{0}/advance'.format(self.url), data=dict()))
+        res_outer = _json(_SESSION.put('{0}/results'.format(self.url), data={'point_name':list(measurements.keys())[0], \
                                                                  'start_time':0-self.step_ref, \
-                                                                 'final_time':self.step_ref*2}).json()
+                                                                 'final_time':self.step_ref*2}))
         df = pd.DataFrame.from_dict(res_outer).set_index('time')
         ref_filepath = os.path.join(get_root_path(), 'testing', 'references', self.name, 'partial_results_outer.csv')
         self.compare_ref_timeseries_df(df, ref_filepath)
@@ -715,29 +989,32 @@ class partialTestTimePeriod(partialChecks):
 
         '''
 
+        # Set invariants for all requests and reference files
+        scenario_url = '{0}/scenario'.format(self.url)
+        advance_url = '{0}/advance'.format(self.url)
+        ref_dir = os.path.join(get_root_path(), 'testing', 'references', self.name)
         # Set time period scenario
-        requests.put('{0}/scenario'.format(self.url), data={'time_period':time_period})
+        _SESSION.put(scenario_url, data={'time_period':time_period})
         # Simulation Loop
         y = 1
         while y:
             # Advance simulation
-            y = requests.post('{0}/advance'.format(self.url), data={}).json()
+            y = _json(_SESSION.post(advance_url, data={}))
         # Check results
         df = self.results_to_df(self.points_check, -np.inf, np.inf, self.url)
-        ref_filepath = os.path.join(get_root_path(), 'testing', 'references', self.name, 'results_{0}.csv'.format(time_period))
+        ref_filepath = os.path.join(ref_dir, 'results_{0}.csv'.format(time_period))
         self.compare_ref_timeseries_df(df,ref_filepath)
+        # Report kpis for all price scenarios
+        price_scenarios = ['constant', 'dynamic', 'highly_dynamic']
+        kpis = self.get_kpis_batch(price_scenarios, self.url)
         # For each price scenario
-        for price_scenario in ['constant', 'dynamic', 'highly_dynamic']:
-            # Set scenario
-            requests.put('{0}/scenario'.format(self.url), data={'electricity_price':price_scenario})
-            # Report kpis
-            res_kpi = requests.get('{0}/kpi'.format(self.url)).json()
+        for price_scenario in price_scenarios:
             # Check kpis
-            df = pd.DataFrame.from_dict(res_kpi, orient='index', columns=['value'])
+            df = pd.DataFrame.from_dict(kpis[price_scenario], orient='index', columns=['value'])
             df.index.name = 'keys'
-            ref_filepath = os.path.join(get_root_path(), 'testing', 'references', self.name, 'kpis_{0}_{1}.csv'.format(time_period, price_scenario))
+            ref_filepath = os.path.join(ref_dir, 'kpis_{0}_{1}.csv'.format(time_period, price_scenario))
             self.compare_ref_values_df(df, ref_filepath)
-        requests.put('{0}/scenario'.format(self.url), data={'electricity_price':'constant'})
+        _SESSION.put(scenario_url, data={'electricity_price':'constant'})
 
 class partialTestSeason(partialChecks):
     '''Partial class for testing the time periods for each test case
@@ -759,37 +1036,35 @@ class partialTestSeason(partialChecks):
 
         '''
 
-        if season == 'winter':
-            start_time = 1*24*3600
-        elif season == 'summer':
-            start_time = 248*24*3600
-        elif season == 'shoulder':
-            start_time = 118*24*3600
-        else:
+        try:
+            start_time = _SEASON_START[season]
+        except KeyError:
             raise ValueError('Season {0} unknown.'.format(season))
         length = 48*3600
+        # Set invariants for all requests and reference files
+        advance_url = '{0}/advance'.format(self.url)
+        ref_dir = os.path.join(get_root_path(), 'testing', 'references', self.name)
         # Initialize test case
-        requests.put('{0}/initialize'.format(self.url), data={'start_time':start_time, 'warmup_period':0})
+        _SESSION.put('{0}/initialize'.format(self.url), data={'start_time':start_time, 'warmup_period':0})
         # Get default simulation step
-        step_def = requests.get('{0}/step'.format(self.url)).json()
+        step_def = _json(_SESSION.get('{0}/step'.format(self.url)))
         # Simulation Loop
         for i in range(int(length/step_def)):
-            # Advance simulation
-            requests.post('{0}/advance'.format(self.url), data={}).json()
-        requests.put('{0}/scenario'.format(self.url), data={'electricity_price':'constant'})
+            # Advance simulation, the measurements are not needed
+            _SESSION.post(advance_url, data={})
+        _SESSION.put('{0}/scenario'.format(self.url), data={'electricity_price':'constant'})
         # Check results
         points = self.get_all_points(self.url)
         df = self.results_to_df(points, start_time, start_time+length, self.url)
-        ref_filepath = os.path.join(get_root_path(), 'testing', 'references', self.name, 'results_{0}.csv'.format(season))
+        ref_filepath = os.path.join(ref_dir, 'results_{0}.csv'.format(season))
         self.compare_ref_timeseries_df(df,ref_filepath)
+        # Report kpis for all price scenarios
+        price_scenarios = ['constant', 'dynamic', 'highly_dynamic']
+        kpis = self.get_kpis_batch(price_scenarios, self.url)
         # For each price scenario
-        for price_scenario in ['constant', 'dynamic', 'highly_dynamic']:
-            # Set scenario
-            requests.put('{0}/scenario'.format(self.url), data={'electricity_price':price_scenario})
-            # Report kpis
-            res_kpi = requests.get('{0}/kpi'.format(self.url)).json()
+        for price_scenario in price_scenarios:
             # Check kpis
-            df = pd.DataFrame.from_dict(res_kpi, orient='index', columns=['value'])
+            df = pd.DataFrame.from_dict(kpis[price_scenario], orient='index', columns=['value'])
             df.index.name = 'keys'
-            ref_filepath = os.path.join(get_root_path(), 'testing', 'references', self.name, 'kpis_{0}_{1}.csv'.format(season, price_scenario))
+            ref_filepath = os.path.join(ref_dir, 'kpis_{0}_{1}.csv'.format(season, price_scenario))
             self.compare_ref_values_df(df, ref_filepath)